@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Benchmark de arranque: mide en procesos nuevos (en frío) cuánto tarda
+
+- importar Django y correr django.setup()
+- un comando de mantención típico (manage.py migrate --check)
+- levantar la app WSGI y responder el primer request (solo settings web)
+
+para el perfil web (settings) y el liviano de workers (settings_worker).
+
+Uso:
+    python benchmarks/arranque.py              # mediana de 5 corridas
+    python benchmarks/arranque.py -n 10
+    python benchmarks/arranque.py --guardar    # además reescribe benchmarks/importtime/*.txt
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+DIRECTORIO_IMPORTTIME = Path(__file__).resolve().parent / 'importtime'
+
+PERFILES = ['pochia_project.settings', 'pochia_project.settings_worker']
+
+SETUP = "import django; django.setup()"
+
+# Se mide dentro del proceso hijo para no contar el arranque del intérprete dos veces
+PRIMER_REQUEST = """
+import json, time
+from wsgiref.util import setup_testing_defaults
+inicio = time.perf_counter()
+from pochia_project.wsgi import application
+cargada = time.perf_counter()
+environ = {'PATH_INFO': '/', 'HTTP_HOST': 'localhost'}
+setup_testing_defaults(environ)
+respuestas = []
+b''.join(application(environ, lambda status, headers: respuestas.append(status)))
+fin = time.perf_counter()
+print(json.dumps({'boot': cargada - inicio, 'primer_request': fin - cargada, 'status': respuestas[0]}))
+"""
+
+
+def _entorno(settings):
+    return {**os.environ, 'DJANGO_SETTINGS_MODULE': settings}
+
+
+def _cronometrar(argumentos, settings):
+    inicio = time.perf_counter()
+    subprocess.run(argumentos, cwd=RAIZ, env=_entorno(settings), check=True, capture_output=True)
+    return time.perf_counter() - inicio
+
+
+def _mediana_ms(valores):
+    return round(statistics.median(valores) * 1000, 1)
+
+
+def medir(settings, repeticiones):
+    resultado = {
+        'django.setup()': _mediana_ms([
+            _cronometrar([sys.executable, '-c', SETUP], settings) for _ in range(repeticiones)
+        ]),
+        'migrate --check': _mediana_ms([
+            _cronometrar([sys.executable, 'manage.py', 'migrate', '--check'], settings)
+            for _ in range(repeticiones)
+        ]),
+    }
+    if settings == 'pochia_project.settings':
+        corridas = []
+        for _ in range(repeticiones):
+            salida = subprocess.run(
+                [sys.executable, '-c', PRIMER_REQUEST],
+                cwd=RAIZ, env=_entorno(settings), check=True, capture_output=True, text=True,
+            )
+            corridas.append(json.loads(salida.stdout))
+        resultado['boot WSGI'] = _mediana_ms([c['boot'] for c in corridas])
+        resultado['primer request'] = _mediana_ms([c['primer_request'] for c in corridas])
+    return resultado
+
+
+def guardar_importtime(settings):
+    # -X importtime escribe en stderr; se guarda el de migrate --check como referencia
+    salida = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'manage.py', 'migrate', '--check'],
+        cwd=RAIZ, env=_entorno(settings), check=True, capture_output=True, text=True,
+    )
+    DIRECTORIO_IMPORTTIME.mkdir(exist_ok=True)
+    archivo = DIRECTORIO_IMPORTTIME / f"{settings.rsplit('.', 1)[-1]}.txt"
+    archivo.write_text(salida.stderr)
+    return archivo
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-n', type=int, default=5, help='corridas por medición (se reporta la mediana)')
+    parser.add_argument('--guardar', action='store_true', help='reescribe los reportes de -X importtime')
+    args = parser.parse_args()
+
+    for settings in PERFILES:
+        print(settings)
+        for nombre, ms in medir(settings, args.n).items():
+            print(f"  {nombre:<18} {ms:>8} ms")
+        if args.guardar:
+            print(f"  importtime -> {guardar_importtime(settings).relative_to(RAIZ)}")
+
+
+if __name__ == '__main__':
+    main()
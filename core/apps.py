@@ -4,3 +4,12 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self):
+        # Registra las señales que invalidan el cache de resúmenes
+        from . import signals  # noqa: F401
+
+        # Log de consultas lentas en toda conexión (web, comandos y shell)
+        from django.db.backends.signals import connection_created
+        from .consultas_lentas import instalar_registro_lentas
+        connection_created.connect(instalar_registro_lentas, dispatch_uid='core.consultas_lentas')
@@ -0,0 +1,67 @@
+import functools
+import logging
+import os
+import site
+import sysconfig
+import time
+import traceback
+
+from django.apps import apps
+from django.conf import settings
+
+# Módulo liviano a propósito: CoreConfig.ready() lo importa en todo proceso
+# (web, comandos, workers), así que no debe arrastrar cProfile ni pstats.
+
+logger = logging.getLogger('core.consultas_lentas')
+
+# Los execute_wrapper de SQL aparecen en el stack pero no son el origen
+ARCHIVOS_IGNORADOS = ('consultas_lentas.py', 'profiler.py')
+
+
+@functools.lru_cache(maxsize=None)
+def _directorios_proyecto():
+    # Solo nuestras apps y el paquete del proyecto: un .venv/ dentro de
+    # BASE_DIR también queda bajo BASE_DIR y no es código nuestro.
+    raiz = str(settings.BASE_DIR)
+    paquetes = tuple(site.getsitepackages() + [sysconfig.get_paths()['purelib']])
+    directorios = [
+        config.path for config in apps.get_app_configs()
+        if config.path.startswith(raiz) and not config.path.startswith(paquetes)
+    ]
+    directorios.append(os.path.join(raiz, 'pochia_project'))
+    return tuple(directorio + os.sep for directorio in directorios)
+
+
+def origen_consulta():
+    # Último frame de nuestro código (no Django ni los wrappers de SQL) que disparó la consulta
+    raiz = str(settings.BASE_DIR)
+    for frame in reversed(traceback.extract_stack()):
+        if frame.filename.startswith(_directorios_proyecto()) and not frame.filename.endswith(ARCHIVOS_IGNORADOS):
+            archivo = os.path.relpath(frame.filename, raiz)
+            return f"{archivo}:{frame.lineno} en {frame.name}"
+    return '-'
+
+
+class RegistroConsultasLentas:
+    """
+    execute_wrapper instalado en cada conexión (ver instalar_registro_lentas):
+    escribe en el log toda consulta que supere SLOW_QUERY_THRESHOLD_MS,
+    venga de un request, un comando o el shell. Los parámetros no se
+    registran porque pueden traer datos de clientes o hashes de claves.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            umbral = getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200)
+            duracion_ms = (time.perf_counter() - inicio) * 1000
+            if umbral is not None and duracion_ms >= umbral:
+                logger.warning("%.1f ms | %s | %s", duracion_ms, origen_consulta(), sql)
+
+
+def instalar_registro_lentas(sender, connection, **kwargs):
+    # connection_created se dispara en cada reconexión del mismo wrapper
+    if not any(isinstance(w, RegistroConsultasLentas) for w in connection.execute_wrappers):
+        connection.execute_wrappers.append(RegistroConsultasLentas())
@@ -0,0 +1,106 @@
+import mimetypes
+import os
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse
+from django.utils.cache import get_conditional_response
+from django.utils._os import safe_join
+from django.utils.http import http_date
+
+# Archivos con hash en el nombre nunca cambian: se cachean "para siempre"
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+# Los nombres originales (sin hash) sí pueden cambiar entre deploys
+CACHE_SIN_HASH = 'public, max-age=60'
+
+# Orden de preferencia de las variantes precomprimidas
+CODIFICACIONES = (('br', '.br'), ('gzip', '.gz'))
+
+
+def codificaciones_aceptadas(cabecera):
+    """
+    Interpreta Accept-Encoding como {codificacion: q}. Respeta q=0 (rechazo
+    explícito) y el comodín `*` para las codificaciones no nombradas.
+    """
+    valores = {}
+    for parte in cabecera.split(','):
+        token, _, parametros = parte.partition(';')
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        for parametro in parametros.split(';'):
+            clave, _, valor = parametro.partition('=')
+            if clave.strip().lower() == 'q':
+                try:
+                    q = float(valor)
+                except ValueError:
+                    q = 0.0
+        valores[token] = q
+    if '*' in valores:
+        for nombre_codificacion, _ in CODIFICACIONES:
+            valores.setdefault(nombre_codificacion, valores['*'])
+    return valores
+
+
+class ArchivosEstaticosMiddleware:
+    """
+    Sirve los archivos de STATIC_ROOT (generados por collectstatic) con
+    cabeceras de cache de larga duración y, si el navegador lo acepta,
+    la variante .br/.gz precomprimida. Si collectstatic no se ha corrido
+    deja pasar el request (en desarrollo los sirve runserver).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefijo = '/' + settings.STATIC_URL.lstrip('/')
+        self.raiz = str(settings.STATIC_ROOT) if settings.STATIC_ROOT else None
+        self.con_hash = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+
+    def __call__(self, request):
+        if (
+            self.raiz
+            and request.method in ('GET', 'HEAD')
+            and request.path_info.startswith(self.prefijo)
+        ):
+            response = self._servir(request, request.path_info[len(self.prefijo):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def _servir(self, request, nombre):
+        try:
+            ruta = safe_join(self.raiz, nombre)
+        except ValueError:
+            return None
+        if not os.path.isfile(ruta):
+            return None
+
+        content_type = mimetypes.guess_type(ruta)[0] or 'application/octet-stream'
+        aceptadas = codificaciones_aceptadas(request.headers.get('Accept-Encoding', ''))
+        candidatas = [
+            (aceptadas[nombre_codificacion], -orden, nombre_codificacion, extension)
+            for orden, (nombre_codificacion, extension) in enumerate(CODIFICACIONES)
+            if aceptadas.get(nombre_codificacion, 0) > 0 and os.path.isfile(ruta + extension)
+        ]
+        codificacion = None
+        if candidatas:
+            # Mayor q del cliente; si empatan, nuestro orden (br antes que gzip)
+            _, _, codificacion, extension = max(candidatas)
+            ruta += extension
+
+        stat = os.stat(ruta)
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        response = get_conditional_response(request, etag=etag, last_modified=int(stat.st_mtime))
+        if response is None:
+            response = FileResponse(open(ruta, 'rb'), content_type=content_type)
+            # FileResponse lo agrega con el nombre de la variante (.gz/.br)
+            del response['Content-Disposition']
+            if codificacion:
+                response['Content-Encoding'] = codificacion
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(stat.st_mtime)
+        response['Vary'] = 'Accept-Encoding'
+        response['Cache-Control'] = CACHE_INMUTABLE if nombre in self.con_hash else CACHE_SIN_HASH
+        return response
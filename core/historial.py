@@ -0,0 +1,133 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch, Q
+from django.utils import timezone
+from .models import Cita, Mascota
+
+# Cuántas citas se muestran por mascota en el historial del cliente.
+# El historial completo está en la página de cada mascota (paginado).
+CITAS_POR_MASCOTA = 20
+
+# Las señales (ver signals.py) invalidan el resumen en cada save()/delete()
+# de una Cita. Lo que no pasa por ellas (QuerySet.update(), SQL directo)
+# queda desactualizado hasta que vence este TTL.
+RESUMEN_TIMEOUT = 60 * 60
+
+# Estados que cuentan como visita (si la fecha ya llegó)
+ESTADOS_VISITA = ['RESERVADA', 'REALIZADA']
+
+
+def clave_resumen(mascota_id):
+    return f"resumen_mascota_{mascota_id}"
+
+
+def invalidar_resumen(mascota_id):
+    if mascota_id:
+        cache.delete(clave_resumen(mascota_id))
+
+
+def citas_historial():
+    # Citas de la más reciente a la más antigua, con el veterinario en el mismo query
+    return Cita.objects.select_related('veterinario').order_by('-fecha', '-hora')
+
+
+def cliente_con_historial(cliente_id):
+    """
+    Carga cliente -> mascotas -> citas -> veterinario en 3 queries fijos,
+    sin importar cuántas mascotas o citas tenga el cliente.
+    """
+    mascotas = Mascota.objects.order_by('nombre').prefetch_related(
+        Prefetch(
+            'cita_set',
+            queryset=citas_historial()[:CITAS_POR_MASCOTA],
+            to_attr='citas_recientes',
+        )
+    )
+    return User.objects.prefetch_related(
+        Prefetch('mascotas', queryset=mascotas, to_attr='lista_mascotas')
+    ).get(id=cliente_id)
+
+
+def _calcular_resumenes(mascota_ids, hoy):
+    # Un solo query agrupado para todas las mascotas que no estaban en cache.
+    # Las reservas futuras no son visitas todavía; los bloques DISPONIBLE
+    # no cuentan para la tasa de cancelación.
+    visita = Q(estado__in=ESTADOS_VISITA, fecha__lte=hoy)
+    filas = (
+        Cita.objects.filter(mascota_id__in=mascota_ids)
+        .exclude(estado='DISPONIBLE')
+        .values('mascota_id')
+        .annotate(
+            total=Count('id'),
+            canceladas=Count('id', filter=Q(estado='CANCELADA')),
+            visitas=Count('id', filter=visita),
+            ultima_visita=Max('fecha', filter=visita),
+        )
+        .order_by()
+    )
+    resumenes = {
+        mascota_id: {'visitas': 0, 'ultima_visita': None, 'tasa_cancelacion': 0.0}
+        for mascota_id in mascota_ids
+    }
+    for fila in filas:
+        total = fila['total']
+        resumenes[fila['mascota_id']] = {
+            'visitas': fila['visitas'],
+            'ultima_visita': fila['ultima_visita'],
+            'tasa_cancelacion': round(fila['canceladas'] / total, 2) if total else 0.0,
+        }
+    return resumenes
+
+
+def _segundos_hasta_medianoche():
+    # Al cambiar el día una reserva de hoy pasa a ser visita sin que nadie
+    # toque la Cita, así que el resumen no puede sobrevivir a la medianoche.
+    ahora = timezone.localtime()
+    manana = ahora.replace(hour=0, minute=0, second=0, microsecond=0) + datetime.timedelta(days=1)
+    return max(1, int((manana - ahora).total_seconds()))
+
+
+def resumenes_mascotas(mascota_ids):
+    """
+    Devuelve {mascota_id: resumen} leyendo desde cache y calculando
+    (en un solo query) solo los que falten.
+    """
+    mascota_ids = list(mascota_ids)
+    claves = {clave_resumen(mascota_id): mascota_id for mascota_id in mascota_ids}
+    en_cache = cache.get_many(claves.keys())
+    resumenes = {claves[clave]: valor for clave, valor in en_cache.items()}
+
+    faltantes = [mascota_id for mascota_id in mascota_ids if mascota_id not in resumenes]
+    if faltantes:
+        nuevos = _calcular_resumenes(faltantes, timezone.localdate())
+        cache.set_many(
+            {clave_resumen(mascota_id): valor for mascota_id, valor in nuevos.items()},
+            min(RESUMEN_TIMEOUT, _segundos_hasta_medianoche()),
+        )
+        resumenes.update(nuevos)
+    return resumenes
+
+
+def resumen_mascota(mascota_id):
+    return resumenes_mascotas([mascota_id])[mascota_id]
+
+
+def cita_a_dict(cita):
+    return {
+        'id': cita.id,
+        'fecha': cita.fecha.isoformat(),
+        'hora': cita.hora.strftime('%H:%M'),
+        'estado': cita.estado,
+        'motivo': cita.motivo,
+        'veterinario': f"{cita.veterinario.first_name} {cita.veterinario.last_name}".strip(),
+    }
+
+
+def resumen_a_dict(resumen):
+    return {
+        'visitas': resumen['visitas'],
+        'ultima_visita': resumen['ultima_visita'].isoformat() if resumen['ultima_visita'] else None,
+        'tasa_cancelacion': resumen['tasa_cancelacion'],
+    }
@@ -0,0 +1,159 @@
+import cProfile
+import itertools
+import os
+import pstats
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+from .consultas_lentas import origen_consulta
+
+# Valores de ?_profile= / X-Profile: que activan el perfil (0 o vacío no)
+VALORES_ACTIVAR = ('1', 'true')
+
+
+# Configuración (ver settings.py). Se lee en cada uso para que
+# override_settings y los cambios en settings tengan efecto.
+def _config(nombre, defecto):
+    return getattr(settings, nombre, defecto)
+
+
+# Los perfiles se guardan en el cache compartido (ver CACHES en settings.py)
+# para que cualquier worker pueda mostrarlos: cada uno bajo su propia clave
+# y una lista con las claves de los últimos PROFILER_MAX_PERFILES.
+CLAVE_INDICE = 'perfiles_indice'
+PERFIL_TIMEOUT = 60 * 60 * 24
+
+# Protege el índice dentro del proceso; entre workers dos perfiles guardados
+# al mismo tiempo pueden pisarse en el índice (es una herramienta de debug).
+_lock = threading.Lock()
+_ids = itertools.count(1)
+
+
+def _clave_perfil(perfil_id):
+    return f"perfil_{perfil_id}"
+
+
+def listar_perfiles():
+    indice = cache.get(CLAVE_INDICE, [])
+    perfiles = cache.get_many([_clave_perfil(perfil_id) for perfil_id in indice])
+    return [
+        perfiles[_clave_perfil(perfil_id)]
+        for perfil_id in reversed(indice)
+        if _clave_perfil(perfil_id) in perfiles
+    ]
+
+
+def obtener_perfil(perfil_id):
+    return cache.get(_clave_perfil(perfil_id))
+
+
+def _guardar_perfil(perfil):
+    # El pid evita que dos workers generen el mismo id
+    perfil['id'] = f"{os.getpid()}-{next(_ids)}"
+    with _lock:
+        indice = cache.get(CLAVE_INDICE, []) + [perfil['id']]
+        maximo = _config('PROFILER_MAX_PERFILES', 20)
+        descartados, indice = indice[:-maximo], indice[-maximo:]
+        cache.set(_clave_perfil(perfil['id']), perfil, PERFIL_TIMEOUT)
+        cache.set(CLAVE_INDICE, indice, PERFIL_TIMEOUT)
+        cache.delete_many([_clave_perfil(perfil_id) for perfil_id in descartados])
+    return perfil['id']
+
+
+class CapturaSQL:
+    """execute_wrapper del modo perfil: guarda cada consulta con su duración y origen."""
+
+    def __init__(self):
+        self.consultas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            # Sin parámetros, igual que el log de lentas: pueden traer datos
+            # de clientes o hashes de claves y esta página la ve todo el staff
+            self.consultas.append({
+                'sql': sql,
+                'duracion_ms': round((time.perf_counter() - inicio) * 1000, 2),
+                'origen': origen_consulta(),
+            })
+
+
+def _top_funciones(profiler):
+    stats = pstats.Stats(profiler)
+    filas = []
+    for (archivo, linea, funcion), (cc, nc, tt, ct, _) in stats.stats.items():
+        filas.append({
+            'funcion': f"{archivo}:{linea}({funcion})",
+            'llamadas': nc,
+            'tiempo_propio_ms': round(tt * 1000, 2),
+            'tiempo_acumulado_ms': round(ct * 1000, 2),
+        })
+    filas.sort(key=lambda fila: fila['tiempo_acumulado_ms'], reverse=True)
+    return filas[:_config('PROFILER_TOP_FUNCIONES', 25)]
+
+
+def _consultas_duplicadas(consultas):
+    conteo = Counter(consulta['sql'] for consulta in consultas)
+    return [
+        {'sql': sql, 'veces': veces}
+        for sql, veces in conteo.most_common()
+        if veces > 1
+    ]
+
+
+class ProfilerMiddleware:
+    """
+    Perfilado opcional para staff: agregar ?_profile=1 o el header
+    X-Profile: 1 a cualquier request. Debe ir después de AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def _quiere_perfil(self, request):
+        pedido = (
+            request.GET.get(_config('PROFILER_PARAM', '_profile'))
+            or request.headers.get(_config('PROFILER_HEADER', 'X-Profile'))
+        )
+        return (pedido or '').strip().lower() in VALORES_ACTIVAR and request.user.is_staff
+
+    def __call__(self, request):
+        if not self._quiere_perfil(request):
+            return self.get_response(request)
+
+        captura = CapturaSQL()
+        profiler = cProfile.Profile()
+        inicio = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Otro profiler ya está activo (otro request perfilado a la vez)
+            return self.get_response(request)
+        try:
+            with connection.execute_wrapper(captura):
+                response = self.get_response(request)
+        finally:
+            profiler.disable()
+        duracion_ms = (time.perf_counter() - inicio) * 1000
+
+        perfil_id = _guardar_perfil({
+            'fecha': timezone.now(),
+            'metodo': request.method,
+            'ruta': request.get_full_path(),
+            'usuario': request.user.get_username(),
+            'status': response.status_code,
+            'duracion_ms': round(duracion_ms, 2),
+            'sql_ms': round(sum(c['duracion_ms'] for c in captura.consultas), 2),
+            'consultas': captura.consultas,
+            'duplicadas': _consultas_duplicadas(captura.consultas),
+            'funciones': _top_funciones(profiler),
+        })
+        response['X-Profile-Id'] = str(perfil_id)
+        return response
@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from .historial import invalidar_resumen
+from .models import Cita
+
+
+# Si la cita cambia de mascota (p.ej. editada en el admin) hay que invalidar
+# también la mascota anterior. Se recuerda la que tenía al cargarse, sin
+# consultar la base en cada save(). Se lee de __dict__ para no disparar un
+# query si el campo fue diferido con only()/defer().
+@receiver(post_init, sender=Cita)
+def recordar_mascota_cargada(sender, instance, **kwargs):
+    instance._mascota_id_anterior = instance.__dict__.get('mascota_id')
+
+
+# Cualquier cambio en una cita deja obsoleto el resumen cacheado de su mascota
+@receiver(post_save, sender=Cita)
+@receiver(post_delete, sender=Cita)
+def invalidar_resumen_mascota(sender, instance, **kwargs):
+    invalidar_resumen(instance.mascota_id)
+    anterior = getattr(instance, '_mascota_id_anterior', None)
+    if anterior != instance.mascota_id:
+        invalidar_resumen(anterior)
+    instance._mascota_id_anterior = instance.mascota_id
@@ -0,0 +1,48 @@
+import gzip
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # Brotli es opcional: sin él solo se generan los .gz
+    brotli = None
+
+# Solo vale la pena comprimir formatos de texto
+EXTENSIONES_COMPRIMIBLES = ('.css', '.js', '.svg', '.txt', '.json', '.map', '.html', '.xml')
+
+# Archivos muy chicos no ganan nada comprimidos
+TAMANO_MINIMO = 512
+
+
+def variantes_comprimidas(contenido):
+    """Devuelve [(extension, contenido_comprimido)] para las variantes que reducen tamaño."""
+    variantes = [('.gz', gzip.compress(contenido, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        variantes.insert(0, ('.br', brotli.compress(contenido, quality=11)))
+    return [(ext, datos) for ext, datos in variantes if len(datos) < len(contenido)]
+
+
+class ComprimidoManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    ManifestStaticFilesStorage que además deja junto a cada archivo con hash
+    sus versiones precomprimidas (.br y .gz) para servirlas sin comprimir
+    en cada request (ver core.estaticos.ArchivosEstaticosMiddleware).
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        for nombre_hash in set(self.hashed_files.values()):
+            if not nombre_hash.endswith(EXTENSIONES_COMPRIMIBLES):
+                continue
+            with self.open(nombre_hash) as archivo:
+                contenido = archivo.read()
+            if len(contenido) < TAMANO_MINIMO:
+                continue
+            for ext, datos in variantes_comprimidas(contenido):
+                if self.exists(nombre_hash + ext):
+                    self.delete(nombre_hash + ext)
+                self.save(nombre_hash + ext, ContentFile(datos))
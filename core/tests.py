@@ -1,3 +1,228 @@
-from django.test import TestCase
+import datetime
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from .estaticos import codificaciones_aceptadas
+from .models import Cita, Mascota
+from .profiler import listar_perfiles, obtener_perfil
+from .storage import brotli
+
+# Las pruebas que solo renderizan páginas no corren collectstatic, así que
+# usan el storage simple (sin manifest); EstaticosTests prueba el real.
+STORAGES_SIN_MANIFEST = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+# Cache en memoria para no tocar (ni vaciar) el cache real del proyecto
+CACHES_PRUEBA = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+}
+
+
+@override_settings(STORAGES=STORAGES_SIN_MANIFEST, CACHES=CACHES_PRUEBA)
+class HistorialTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.vet = User.objects.create_user('vet', password='x', first_name='Ana', last_name='Rojas')
+        self.cliente = User.objects.create_user('cliente', password='x', first_name='Juan')
+        self.otro = User.objects.create_user('otro', password='x')
+        self.mascotas = [
+            Mascota.objects.create(
+                dueno=self.cliente, nombre=f"Mascota {i}", raza='Quiltro',
+                fecha_nacimiento=datetime.date(2020, 1, 1),
+            )
+            for i in range(3)
+        ]
+        for mascota in self.mascotas:
+            for dia in range(10):
+                Cita.objects.create(
+                    veterinario=self.vet, cliente=self.cliente, mascota=mascota,
+                    fecha=datetime.date(2024, 1, 1) + datetime.timedelta(days=dia),
+                    hora=datetime.time(10, 0),
+                    estado='CANCELADA' if dia % 5 == 0 else 'REALIZADA',
+                )
+
+    def test_historial_cliente_queries_fijos(self):
+        self.client.login(username='cliente', password='x')
+        url = reverse('historial_cliente', args=[self.cliente.id])
+        # sesión + usuario + cliente + mascotas + citas + resúmenes
+        with self.assertNumQueries(6):
+            respuesta = self.client.get(url)
+        self.assertEqual(respuesta.status_code, 200)
+
+        # Con los resúmenes en cache ya no se agrega el query agrupado
+        with self.assertNumQueries(5):
+            self.client.get(url)
+
+    def test_api_historial_cliente(self):
+        self.client.login(username='cliente', password='x')
+        datos = self.client.get(reverse('api_historial_cliente', args=[self.cliente.id])).json()
+        self.assertEqual(len(datos['mascotas']), 3)
+        resumen = datos['mascotas'][0]['resumen']
+        self.assertEqual(resumen['visitas'], 8)
+        self.assertEqual(resumen['ultima_visita'], '2024-01-10')
+        self.assertEqual(resumen['tasa_cancelacion'], 0.2)
+        self.assertEqual(datos['mascotas'][0]['citas'][0]['veterinario'], 'Ana Rojas')
+
+    def test_resumen_se_invalida_al_cambiar_cita(self):
+        self.client.login(username='cliente', password='x')
+        mascota = self.mascotas[0]
+        url = reverse('api_historial_mascota', args=[mascota.id])
+        self.assertEqual(self.client.get(url).json()['resumen']['visitas'], 8)
+
+        mascota.cita_set.filter(estado='REALIZADA').first().delete()
+        self.assertEqual(self.client.get(url).json()['resumen']['visitas'], 7)
+
+    def test_reserva_futura_no_cuenta_como_visita(self):
+        self.client.login(username='cliente', password='x')
+        mascota = self.mascotas[0]
+        Cita.objects.create(
+            veterinario=self.vet, cliente=self.cliente, mascota=mascota,
+            fecha=datetime.date.today() + datetime.timedelta(days=30),
+            hora=datetime.time(10, 0), estado='RESERVADA',
+        )
+        resumen = self.client.get(reverse('api_historial_mascota', args=[mascota.id])).json()['resumen']
+        self.assertEqual(resumen['visitas'], 8)
+        self.assertEqual(resumen['ultima_visita'], '2024-01-10')
+
+    def test_cambiar_cita_de_mascota_invalida_ambas(self):
+        self.client.login(username='cliente', password='x')
+        origen, destino = self.mascotas[0], self.mascotas[1]
+        url_origen = reverse('api_historial_mascota', args=[origen.id])
+        url_destino = reverse('api_historial_mascota', args=[destino.id])
+        self.assertEqual(self.client.get(url_origen).json()['resumen']['visitas'], 8)
+        self.assertEqual(self.client.get(url_destino).json()['resumen']['visitas'], 8)
+
+        cita = origen.cita_set.filter(estado='REALIZADA').first()
+        cita.mascota = destino
+        # Sin SELECT previo: la mascota anterior se recordó al cargar la cita
+        with self.assertNumQueries(1):
+            cita.save()
+        self.assertEqual(self.client.get(url_origen).json()['resumen']['visitas'], 7)
+        self.assertEqual(self.client.get(url_destino).json()['resumen']['visitas'], 9)
+
+    def test_historial_ajeno_no_visible(self):
+        self.client.login(username='otro', password='x')
+        respuesta = self.client.get(reverse('historial_cliente', args=[self.cliente.id]))
+        self.assertEqual(respuesta.status_code, 404)
+        respuesta = self.client.get(reverse('historial_mascota', args=[self.mascotas[0].id]))
+        self.assertEqual(respuesta.status_code, 404)
+
+
+@override_settings(STORAGES=STORAGES_SIN_MANIFEST, CACHES=CACHES_PRUEBA)
+class ProfilerTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user('staff', password='x', is_staff=True)
+        self.cliente = User.objects.create_user('cliente', password='x')
+        for hora in (9, 10, 11):
+            Cita.objects.create(
+                veterinario=self.staff, fecha=datetime.date.today(), hora=datetime.time(hora, 0),
+            )
+
+    def test_staff_puede_perfilar(self):
+        self.client.login(username='staff', password='x')
+        respuesta = self.client.get(reverse('lista_citas'), {'_profile': '1'})
+        perfil_id = respuesta['X-Profile-Id']
+
+        detalle = self.client.get(reverse('detalle_perfil', args=[perfil_id]))
+        self.assertEqual(detalle.status_code, 200)
+        perfil = detalle.context['perfil']
+        self.assertTrue(perfil['funciones'])
+        self.assertTrue(perfil['consultas'])
+        self.assertTrue(any(c['origen'].startswith('core') for c in perfil['consultas']))
+        self.assertTrue(all('params' not in c for c in perfil['consultas']))
+
+    def test_detecta_consultas_duplicadas(self):
+        # La agenda pide el veterinario de cada cita por separado (N+1)
+        self.client.login(username='staff', password='x')
+        respuesta = self.client.get(reverse('lista_citas'), {'_profile': '1'})
+        perfil = obtener_perfil(respuesta['X-Profile-Id'])
+        self.assertTrue(perfil['duplicadas'])
+        self.assertGreaterEqual(perfil['duplicadas'][0]['veces'], 3)
+
+    def test_header_activa_el_perfil_para_staff(self):
+        self.client.login(username='staff', password='x')
+        respuesta = self.client.get(reverse('lista_citas'), HTTP_X_PROFILE='1')
+        self.assertIn('X-Profile-Id', respuesta)
+
+    def test_cero_no_activa_el_perfil(self):
+        self.client.login(username='staff', password='x')
+        respuesta = self.client.get(reverse('lista_citas'), {'_profile': '0'})
+        self.assertNotIn('X-Profile-Id', respuesta)
+        respuesta = self.client.get(reverse('lista_citas'), HTTP_X_PROFILE='0')
+        self.assertNotIn('X-Profile-Id', respuesta)
+
+    def test_cliente_no_activa_el_perfil(self):
+        self.client.login(username='cliente', password='x')
+        respuesta = self.client.get(reverse('lista_citas'), HTTP_X_PROFILE='1')
+        self.assertNotIn('X-Profile-Id', respuesta)
+
+    @override_settings(PROFILER_MAX_PERFILES=2)
+    def test_buffer_guarda_solo_los_ultimos(self):
+        self.client.login(username='staff', password='x')
+        ids = [
+            self.client.get(reverse('home'), {'_profile': '1'})['X-Profile-Id']
+            for _ in range(3)
+        ]
+        self.assertEqual([perfil['id'] for perfil in listar_perfiles()], [ids[2], ids[1]])
+        self.assertIsNone(obtener_perfil(ids[0]))
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_consulta_lenta_fuera_de_un_request(self):
+        with self.assertLogs('core.consultas_lentas', level='WARNING') as registro:
+            User.objects.filter(username='cliente').exists()
+        self.assertIn('auth_user', registro.output[0])
+        self.assertNotIn("'cliente'", registro.output[0])
+
+
+@override_settings(CACHES=CACHES_PRUEBA)
+class EstaticosTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # collectstatic (con compresión) una sola vez para toda la clase
+        directorio = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(directorio.cleanup)
+        configuracion = override_settings(STATIC_ROOT=directorio.name)
+        configuracion.enable()
+        cls.addClassCleanup(configuracion.disable)
+        super().setUpClass()
+        call_command('collectstatic', interactive=False, verbosity=0)
+        cls.url_css = staticfiles_storage.url('core/vendor/bootstrap-5.3.0/css/bootstrap.min.css')
+
+    def test_home_usa_archivos_con_hash(self):
+        respuesta = self.client.get(reverse('home'))
+        self.assertContains(respuesta, self.url_css)
+        self.assertNotContains(respuesta, 'cdn.jsdelivr.net')
+
+    def test_sirve_variante_comprimida_con_cache_inmutable(self):
+        respuesta = self.client.get(self.url_css, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertEqual(respuesta['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', respuesta['Cache-Control'])
+
+        repetida = self.client.get(self.url_css, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=respuesta['ETag'])
+        self.assertEqual(repetida.status_code, 304)
+
+    @skipUnless(brotli, "brotli es opcional y no está instalado")
+    def test_prefiere_brotli_si_existe(self):
+        respuesta = self.client.get(self.url_css, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(respuesta['Content-Encoding'], 'br')
+
+    def test_respeta_q_cero(self):
+        respuesta = self.client.get(self.url_css, HTTP_ACCEPT_ENCODING='gzip;q=0, identity')
+        self.assertEqual(respuesta.status_code, 200)
+        self.assertNotIn('Content-Encoding', respuesta)
+
+    def test_codificaciones_aceptadas(self):
+        self.assertEqual(
+            codificaciones_aceptadas('gzip;q=0.5, br;q=0, *;q=0.1'),
+            {'gzip': 0.5, 'br': 0.0, '*': 0.1},
+        )
 
-# Create your tests here.
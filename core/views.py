@@ -1,10 +1,17 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import Group, User
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
 from django.utils import timezone
 from .models import Cita, Mascota, Notificacion
+from .profiler import listar_perfiles, obtener_perfil
+from .historial import (
+    cliente_con_historial, citas_historial, resumenes_mascotas, resumen_mascota,
+    cita_a_dict, resumen_a_dict, CITAS_POR_MASCOTA,
+)
 # AQUI AGREGAMOS EL NUEVO FORMULARIO: CancelarMasivoForm
 from .forms import RegistroClienteForm, CitaForm, ReservaForm, CancelarMasivoForm
 
@@ -209,4 +216,103 @@ def eliminar_cita_permanente(request, cita_id):
     if cita.estado == 'CANCELADA':
         cita.delete()
         
-    return redirect('lista_citas')
\ No newline at end of file
+    return redirect('lista_citas')
+
+# --- HISTORIAL DE CLIENTES Y MASCOTAS ---
+
+# Citas por página en el historial completo de una mascota
+CITAS_POR_PAGINA = 25
+
+def _puede_ver_historial(usuario, cliente_id):
+    # El staff ve todos los historiales, el cliente solo el suyo
+    return usuario.is_staff or usuario.id == cliente_id
+
+def _cargar_historial_cliente(request, cliente_id):
+    if not _puede_ver_historial(request.user, cliente_id):
+        raise Http404
+    try:
+        cliente = cliente_con_historial(cliente_id)
+    except User.DoesNotExist:
+        raise Http404
+    resumenes = resumenes_mascotas(m.id for m in cliente.lista_mascotas)
+    for mascota in cliente.lista_mascotas:
+        mascota.resumen = resumenes[mascota.id]
+    return cliente
+
+def _cargar_mascota(request, mascota_id):
+    mascota = get_object_or_404(Mascota.objects.select_related('dueno'), id=mascota_id)
+    if not _puede_ver_historial(request.user, mascota.dueno_id):
+        raise Http404
+    return mascota
+
+@login_required
+def historial_cliente(request, cliente_id):
+    cliente = _cargar_historial_cliente(request, cliente_id)
+    return render(request, 'core/historial_cliente.html', {
+        'cliente': cliente,
+        'citas_por_mascota': CITAS_POR_MASCOTA,
+    })
+
+@login_required
+def historial_mascota(request, mascota_id):
+    mascota = _cargar_mascota(request, mascota_id)
+    paginador = Paginator(citas_historial().filter(mascota=mascota), CITAS_POR_PAGINA)
+    pagina = paginador.get_page(request.GET.get('page'))
+    return render(request, 'core/historial_mascota.html', {
+        'mascota': mascota,
+        'resumen': resumen_mascota(mascota.id),
+        'pagina': pagina,
+    })
+
+@login_required
+def api_historial_cliente(request, cliente_id):
+    cliente = _cargar_historial_cliente(request, cliente_id)
+    return JsonResponse({
+        'cliente': {
+            'id': cliente.id,
+            'nombre': f"{cliente.first_name} {cliente.last_name}".strip(),
+        },
+        'mascotas': [
+            {
+                'id': mascota.id,
+                'nombre': mascota.nombre,
+                'especie': mascota.especie,
+                'raza': mascota.raza,
+                'resumen': resumen_a_dict(mascota.resumen),
+                'citas': [cita_a_dict(cita) for cita in mascota.citas_recientes],
+            }
+            for mascota in cliente.lista_mascotas
+        ],
+    })
+
+@login_required
+def api_historial_mascota(request, mascota_id):
+    mascota = _cargar_mascota(request, mascota_id)
+    paginador = Paginator(citas_historial().filter(mascota=mascota), CITAS_POR_PAGINA)
+    pagina = paginador.get_page(request.GET.get('page'))
+    return JsonResponse({
+        'mascota': {
+            'id': mascota.id,
+            'nombre': mascota.nombre,
+            'especie': mascota.especie,
+            'raza': mascota.raza,
+            'dueno_id': mascota.dueno_id,
+        },
+        'resumen': resumen_a_dict(resumen_mascota(mascota.id)),
+        'pagina': pagina.number,
+        'total_paginas': paginador.num_pages,
+        'citas': [cita_a_dict(cita) for cita in pagina],
+    })
+
+# --- PERFILES DE RENDIMIENTO (SOLO STAFF) ---
+
+@staff_member_required
+def lista_perfiles(request):
+    return render(request, 'core/perfiles.html', {'perfiles': listar_perfiles()})
+
+@staff_member_required
+def detalle_perfil(request, perfil_id):
+    perfil = obtener_perfil(perfil_id)
+    if perfil is None:
+        raise Http404
+    return render(request, 'core/perfil_detalle.html', {'perfil': perfil})
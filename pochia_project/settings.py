@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
+import tempfile
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,12 +44,19 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # 304 Not Modified para páginas que el navegador ya tiene (ETag/Last-Modified)
+    'django.middleware.http.ConditionalGetMiddleware',
+    # Archivos estáticos con hash, precomprimidos y con cache de larga duración
+    'core.estaticos.ArchivosEstaticosMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Perfilado opcional para staff (?_profile=1). El log de consultas lentas
+    # no depende de esto: se instala por conexión en CoreConfig.ready()
+    'core.profiler.ProfilerMiddleware',
 ]
 
 ROOT_URLCONF = 'pochia_project.urls'
@@ -82,6 +91,24 @@ DATABASES = {
 }
 
 
+# Cache (resúmenes de historial por mascota)
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Tiene que ser compartido entre procesos: la invalidación por señales
+# (core/signals.py) ocurre en el proceso que modifica la Cita, y los demás
+# workers web y comandos deben ver ese borrado. Con varios servidores
+# habría que cambiarlo por Redis/Memcached.
+# El directorio se configura con POCHIA_CACHE_DIR (por defecto, fuera del repo).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'POCHIA_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'pochia_cache')
+        ),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -117,6 +144,19 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
 STATIC_URL = 'static/'
+# Destino de `python manage.py collectstatic` (de aquí se sirven en producción)
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    # Nombres con hash de contenido + variantes .gz (ver core/storage.py).
+    # Las .br se generan solo si está instalado el paquete opcional `brotli`.
+    'staticfiles': {
+        'BACKEND': 'core.storage.ComprimidoManifestStaticFilesStorage',
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -126,4 +166,45 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # A dónde ir después del login
 LOGIN_REDIRECT_URL = 'home'
 # A dónde ir después del logout
-LOGOUT_REDIRECT_URL = 'home'
\ No newline at end of file
+LOGOUT_REDIRECT_URL = 'home'
+
+
+# Perfilado de requests (ver core/profiler.py)
+# Se activa con ?_profile=1 o el header X-Profile: 1 (solo staff)
+PROFILER_PARAM = '_profile'
+PROFILER_HEADER = 'X-Profile'
+# Cuántos perfiles se guardan en el cache compartido (los más antiguos se descartan)
+PROFILER_MAX_PERFILES = 20
+PROFILER_TOP_FUNCIONES = 25
+
+# Toda consulta SQL que tarde más que esto (en ms) se escribe en el log
+# de consultas lentas. None lo desactiva.
+SLOW_QUERY_THRESHOLD_MS = 200
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{asctime} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'consultas_lentas': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': BASE_DIR / 'consultas_lentas.log',
+            'maxBytes': 5 * 1024 * 1024,
+            'backupCount': 3,
+            'delay': True,
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'core.consultas_lentas': {
+            'handlers': ['consultas_lentas'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
@@ -0,0 +1,47 @@
+"""
+Perfil liviano de settings para comandos de mantención y workers en segundo plano.
+
+Uso:
+    DJANGO_SETTINGS_MODULE=pochia_project.settings_worker python manage.py migrate --check
+
+Hereda todo de settings.py y quita lo que solo sirve para atender páginas:
+- El admin se carga con SimpleAdminConfig (sin autodiscover de admin.py),
+  así sus migraciones siguen visibles para `migrate`.
+- Sin messages ni staticfiles (no hay requests ni collectstatic aquí).
+- Sin middleware: los comandos no pasan por el ciclo request/response.
+
+No usar para el servidor web (wsgi.py / asgi.py siguen con settings.py).
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, TEMPLATES
+
+INSTALLED_APPS = [
+    'django.contrib.admin.apps.SimpleAdminConfig' if app == 'django.contrib.admin' else app
+    for app in INSTALLED_APPS
+    if app not in ('django.contrib.messages', 'django.contrib.staticfiles')
+]
+
+MIDDLEWARE = []
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                procesador
+                for procesador in TEMPLATES[0]['OPTIONS']['context_processors']
+                if procesador != 'django.contrib.messages.context_processors.messages'
+            ],
+        },
+    },
+]
+
+# El admin queda instalado solo por sus migraciones; sin web no necesita
+# messages, sesiones ni autenticación por middleware.
+SILENCED_SYSTEM_CHECKS = ['admin.E404', 'admin.E406', 'admin.E408', 'admin.E409', 'admin.E410']
+
+# Los checks de `migrate`/`check` importan el URLconf; el de la web arrastra
+# admin, vistas y formularios, que un worker nunca usa.
+ROOT_URLCONF = 'pochia_project.urls_worker'
@@ -3,6 +3,9 @@ from django.urls import path, include
 from core import views
 
 urlpatterns = [
+    # Perfiles de rendimiento (antes de admin/ para que no los capture el admin)
+    path('admin/perfiles/', views.lista_perfiles, name='lista_perfiles'),
+    path('admin/perfiles/<str:perfil_id>/', views.detalle_perfil, name='detalle_perfil'),
     path('admin/', admin.site.urls),
     # Rutas de autenticación (login, logout) que vienen con Django
     path('accounts/', include('django.contrib.auth.urls')),
@@ -23,4 +26,10 @@ urlpatterns = [
     path('reagendar/<int:cita_id>/', views.reagendar_cita, name='reagendar_cita'),
     path('reagendar-confirmar/<int:nueva_cita_id>/<int:antigua_cita_id>/', views.confirmar_reagendamiento, name='confirmar_reagendamiento'),
     path('eliminar-definitivo/<int:cita_id>/', views.eliminar_cita_permanente, name='eliminar_cita_permanente'),
+
+    # Historial de clientes y mascotas (página + API JSON)
+    path('historial/cliente/<int:cliente_id>/', views.historial_cliente, name='historial_cliente'),
+    path('historial/mascota/<int:mascota_id>/', views.historial_mascota, name='historial_mascota'),
+    path('api/historial/cliente/<int:cliente_id>/', views.api_historial_cliente, name='api_historial_cliente'),
+    path('api/historial/mascota/<int:mascota_id>/', views.api_historial_mascota, name='api_historial_mascota'),
 ]
\ No newline at end of file
@@ -0,0 +1,2 @@
+# URLconf vacío para settings_worker: los comandos de mantención no atienden páginas
+urlpatterns = []